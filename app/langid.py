@@ -0,0 +1,200 @@
+"""Identification de langue par n-grammes de caractères hachés.
+
+Modèle naïf bayésien multinomial : chaque n-gramme (1 à 3 caractères) est haché
+dans ``N_FEATURES`` cases et la matrice de poids ``(N_FEATURES, n_langues)``
+contient les log-probabilités apprises hors ligne sur le petit corpus de
+``app/data/langid``. Le score d'un lot de textes se calcule en un seul passage
+NumPy (hachage vectorisé + ``bincount``), sans boucle Python par n-gramme.
+
+La confiance est calibrée : les log-vraisemblances sont moyennées par n-gramme
+(sinon la somme sature la softmax dès quelques mots) puis multipliées par
+``TEMPERATURE``. Les textes trop courts ou majoritairement hors alphabet latin
+sont rejetés avec le code ``UNKNOWN``.
+
+Ré-entraîner après modification du corpus :
+
+    python -m app.langid
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from app.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data" / "langid"
+WEIGHTS_PATH = DATA_DIR / "weights.npz"
+
+N_FEATURES_BITS = 14
+N_FEATURES = 1 << N_FEATURES_BITS
+NGRAM_ORDERS = (1, 2, 3)
+
+UNKNOWN = "und"
+# Échelle appliquée à la log-vraisemblance moyenne par n-gramme : un écart de
+# 0.5 nat par n-gramme entre deux langues donne ~0.9 de confiance
+TEMPERATURE = 5.0
+# En dessous de ce nombre de lettres latines, la langue n'est pas déterminée
+MIN_LETTERS = 4
+
+_PRIME = np.uint64(1_000_003)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(64 - N_FEATURES_BITS)
+
+
+def _encode(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Retourne (points de code, indice du texte) du lot concaténé, textes entourés d'espaces."""
+    padded = [f" {t.lower()} " for t in texts]
+    lengths = np.fromiter((len(t) for t in padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    return codes, np.repeat(np.arange(len(padded)), lengths)
+
+
+def _letter_counts(codes: np.ndarray, rows: np.ndarray, n_texts: int) -> tuple[np.ndarray, np.ndarray]:
+    """Nombre de lettres latines et non latines (grec, cyrillique, CJK…) par texte."""
+    latin = ((codes >= 0x61) & (codes <= 0x7A)) | ((codes >= 0xC0) & (codes <= 0x24F) & (codes != 0xD7) & (codes != 0xF7))
+    non_latin = ((codes >= 0x370) & (codes < 0x2000)) | ((codes >= 0x3040) & (codes < 0xD7B0))
+    return (
+        np.bincount(rows[latin], minlength=n_texts),
+        np.bincount(rows[non_latin], minlength=n_texts),
+    )
+
+
+def _ngram_hashes(codes: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Retourne (case de hachage, indice du texte) pour chaque n-gramme du lot."""
+    all_hashes, all_rows = [], []
+    for n in NGRAM_ORDERS:
+        m = len(codes) - n + 1
+        if m <= 0:
+            continue
+        h = np.full(m, n, dtype=np.uint64)
+        for k in range(n):
+            h = h * _PRIME + codes[k : k + m]
+        # un n-gramme ne doit pas chevaucher deux textes
+        same_text = rows[:m] == rows[n - 1 : n - 1 + m]
+        all_hashes.append((h[same_text] * _GOLDEN) >> _SHIFT)
+        all_rows.append(rows[:m][same_text])
+
+    if not all_hashes:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(all_hashes).astype(np.int64), np.concatenate(all_rows)
+
+
+class LanguageIdentifier:
+    def __init__(self, langs: list[str], weights: np.ndarray, bias: np.ndarray):
+        self.langs = list(langs)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+
+    @classmethod
+    def train(cls, corpus: dict[str, list[str]], alpha: float = 0.1) -> "LanguageIdentifier":
+        """Apprend les log-probabilités lissées (Laplace) de chaque langue."""
+        langs = sorted(corpus)
+        weights = np.empty((N_FEATURES, len(langs)), dtype=np.float64)
+        for j, lang in enumerate(langs):
+            hashes, _ = _ngram_hashes(*_encode(corpus[lang]))
+            counts = np.bincount(hashes, minlength=N_FEATURES) + alpha
+            weights[:, j] = np.log(counts / counts.sum())
+        # a priori uniforme : la taille du corpus ne doit pas biaiser la décision
+        bias = np.full(len(langs), -np.log(len(langs)))
+        return cls(langs, weights, bias)
+
+    @classmethod
+    def from_corpus(cls, directory: Path = DATA_DIR) -> "LanguageIdentifier":
+        corpus = {
+            path.stem: [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+            for path in sorted(directory.glob("*.txt"))
+        }
+        return cls.train(corpus)
+
+    @classmethod
+    def load(cls, path: Path = WEIGHTS_PATH) -> "LanguageIdentifier":
+        with np.load(path) as data:
+            return cls([str(lang) for lang in data["langs"]], data["weights"], data["bias"])
+
+    def save(self, path: Path = WEIGHTS_PATH) -> None:
+        np.savez_compressed(path, langs=np.array(self.langs), weights=self.weights, bias=self.bias)
+
+    def _scores(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Probabilités calibrées ``(len(texts), len(langs))`` et masque des textes rejetés."""
+        codes, rows = _encode(texts)
+        hashes, ngram_rows = _ngram_hashes(codes, rows)
+        contributions = self.weights[hashes]
+        n_ngrams = np.maximum(np.bincount(ngram_rows, minlength=len(texts)), 1)
+        logits = np.empty((len(texts), len(self.langs)), dtype=np.float64)
+        for j in range(len(self.langs)):
+            logits[:, j] = np.bincount(ngram_rows, weights=contributions[:, j], minlength=len(texts))
+        logits = TEMPERATURE * logits / n_ngrams[:, None] + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        proba = np.exp(logits)
+        proba /= proba.sum(axis=1, keepdims=True)
+
+        latin, non_latin = _letter_counts(codes, rows, len(texts))
+        rejected = (latin < MIN_LETTERS) | (non_latin > latin)
+        return proba, rejected
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        """Probabilités calibrées ``(len(texts), len(langs))`` pour tout le lot (sans rejet)."""
+        return self._scores(texts)[0]
+
+    def detect(self, texts: list[str]) -> list[tuple[str, float]]:
+        """Retourne (code langue NLLB, confiance) pour chaque texte.
+
+        Les textes trop courts ou hors alphabet latin donnent ``(UNKNOWN, 0.0)``.
+        """
+        if not texts:
+            return []
+        proba, rejected = self._scores(texts)
+        best = proba.argmax(axis=1)
+        confidence = proba[np.arange(len(texts)), best]
+        return [
+            (UNKNOWN, 0.0) if reject else (self.langs[i], float(p))
+            for i, p, reject in zip(best, confidence, rejected, strict=True)
+        ]
+
+    def detect_one(self, text: str) -> tuple[str, float]:
+        return self.detect([text])[0]
+
+
+def language_penalties(
+    task_languages: list[tuple[str, ...] | None],
+    lang: str,
+    confidence: float,
+    min_confidence: float,
+    penalty: float,
+) -> np.ndarray:
+    """Pénalité à soustraire au score de chaque tâche qui ne gère pas ``lang``.
+
+    ``None`` dans ``task_languages`` signifie « toutes les langues ». Rien n'est
+    pénalisé si la langue est indéterminée ou la confiance trop faible.
+    """
+    penalties = np.zeros(len(task_languages), dtype=np.float32)
+    if lang == UNKNOWN or confidence < min_confidence:
+        return penalties
+    for i, languages in enumerate(task_languages):
+        if languages is not None and lang not in languages:
+            penalties[i] = penalty * confidence
+    return penalties
+
+
+_identifier: LanguageIdentifier | None = None
+
+
+def get_identifier() -> LanguageIdentifier:
+    """Charge les poids pré-entraînés au premier appel (ou entraîne depuis le corpus à défaut)."""
+    global _identifier
+
+    if _identifier is None:
+        if WEIGHTS_PATH.exists():
+            _identifier = LanguageIdentifier.load()
+        else:
+            logger.warning("No language weights at %s; training from bundled corpus", WEIGHTS_PATH)
+            _identifier = LanguageIdentifier.from_corpus()
+    return _identifier
+
+
+if __name__ == "__main__":
+    identifier = LanguageIdentifier.from_corpus()
+    identifier.save()
+    logger.info("Language identifier trained on %s and saved to %s", identifier.langs, WEIGHTS_PATH)
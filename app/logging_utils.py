@@ -1,12 +1,106 @@
+import atexit
+import itertools
+import json
 import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Configuration via environment variables:
+#   MAESTRO_LOG_LEVEL         niveau racine (INFO par défaut, DEBUG active les traces de routage)
+#   MAESTRO_LOG_FORMAT        "text" (défaut) ou "json" pour la sortie console
+#   MAESTRO_LOG_JSON_FILE     chemin d'un fichier JSON Lines recevant tous les enregistrements
+#   MAESTRO_SCORE_SAMPLE_RATE fraction des requêtes dont les scores sont tracés (0.01 par défaut)
+
+_TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_lock = threading.Lock()
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Sérialise chaque enregistrement en une ligne JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, _DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class Sampler:
+    """Laisse passer un appel sur ``1 / rate`` (compteur, sans aléatoire)."""
+
+    def __init__(self, rate: float):
+        self.every = 0 if rate <= 0 else max(1, round(1 / min(rate, 1.0)))
+        self._counter = itertools.count()
+
+    def __call__(self) -> bool:
+        return self.every > 0 and next(self._counter) % self.every == 0
+
+
+def _build_handlers() -> list[logging.Handler]:
+    console = logging.StreamHandler()
+    if os.getenv("MAESTRO_LOG_FORMAT", "text").lower() == "json":
+        console.setFormatter(JsonFormatter())
+    else:
+        console.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_DATE_FORMAT))
+    handlers: list[logging.Handler] = [console]
+
+    json_file = os.getenv("MAESTRO_LOG_JSON_FILE")
+    if json_file:
+        sink = logging.FileHandler(json_file, encoding="utf-8")
+        sink.setFormatter(JsonFormatter())
+        handlers.append(sink)
+    return handlers
+
+
+def _level_from_env() -> int:
+    """Niveau de MAESTRO_LOG_LEVEL, INFO si absent ou invalide."""
+    level = logging.getLevelName(os.getenv("MAESTRO_LOG_LEVEL", "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def configure_logging() -> None:
+    """Installe une seule fois le handler asynchrone sur le logger racine.
+
+    Les écritures (console, fichier JSON) se font dans le thread du
+    QueueListener ; seul le message est mis en forme dans le thread appelant,
+    comme avec tout QueueHandler. Le chemin chaud évite ce coût en testant
+    ``isEnabledFor`` avant de construire ses traces.
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+    with _lock:
+        if _listener is not None:
+            return
+        level = _level_from_env()
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(QueueHandler(log_queue))
+        _listener = listener
+
+
+def score_sampler() -> Sampler:
+    return Sampler(float(os.getenv("MAESTRO_SCORE_SAMPLE_RATE", "0.01")))
 
 
 def get_logger(
     name: str,
 ) -> logging.Logger:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    configure_logging()
     return logging.getLogger(name)
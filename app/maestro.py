@@ -1,10 +1,12 @@
+import logging
 from functools import cached_property
 from typing import Any
 
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
-from app.logging_utils import get_logger
+from app.langid import get_identifier, language_penalties
+from app.logging_utils import get_logger, score_sampler
 from app.tasks.base import Task
 from app.tasks.image_captioning import task as image_captioning_task
 from app.tasks.ocr import task as ocr_task
@@ -13,6 +15,28 @@ from app.tasks.web_search import task as web_search_task
 
 logger = get_logger(__name__)
 
+# Confiance minimale de l'identification de langue pour pénaliser une tâche
+LANGUAGE_FILTER_CONFIDENCE = 0.9
+# Pénalité (en similarité cosinus, pondérée par la confiance) pour une tâche
+# qui ne gère pas la langue détectée : un score nettement meilleur l'emporte encore
+LANGUAGE_PENALTY = 0.15
+
+
+class _ScoreDump:
+    """Formatage paresseux des scores : évalué seulement si l'enregistrement est émis."""
+
+    __slots__ = ("tasks", "scores")
+
+    def __init__(self, tasks: list[Task], scores: np.ndarray):
+        self.tasks = tasks
+        self.scores = scores
+
+    def __str__(self) -> str:
+        return " | ".join(
+            f"{task.name}: {score:.2f}" for task, score in zip(self.tasks, self.scores, strict=False)
+        )
+
+
 class Maestro:
     def __init__(self, embedding_model: str = "all-MiniLM-L6-v2", threshold: float = 0.20, encoder_override: Any | None = None):
         """Initialize the Maestro router.
@@ -30,7 +54,8 @@ class Maestro:
             image_captioning_task,
             ocr_task,
         ]
-        print("Maestro initialized with tasks:", [t.name for t in self.tasks])
+        self._score_sampler = score_sampler()
+        logger.info("Maestro initialized with tasks: %s", [t.name for t in self.tasks])
 
     @cached_property
     def encoder(self) -> SentenceTransformer:
@@ -51,18 +76,27 @@ class Maestro:
         query_vec = self.encoder.encode([query], normalize_embeddings=True)
         scores = (query_vec @ self.task_embeddings.T)[0]
 
-        for task, score in zip(self.tasks, scores, strict=False):
-            logger.info(f"Tâche : {task.name} | Score : {score:.2f}")
+        # Pré-filtre : pénalise (sans l'exclure) une tâche qui ne gère pas la langue détectée.
+        # Aucune détection si aucune tâche ne restreint ses langues.
+        lang, confidence = None, 0.0
+        if any(task.languages is not None for task in self.tasks):
+            lang, confidence = get_identifier().detect_one(query)
+            scores = scores - language_penalties(
+                [task.languages for task in self.tasks], lang, confidence, LANGUAGE_FILTER_CONFIDENCE, LANGUAGE_PENALTY
+            )
 
         best_idx = int(np.argmax(scores))
         best_score = float(scores[best_idx])
         best_task = self.tasks[best_idx]
 
-
-
-        logger.info("Query routed to task: %s (score %.3f)", best_task.name, best_score)
+        if logger.isEnabledFor(logging.DEBUG):
+            if self._score_sampler():
+                logger.debug("Scores for %r: %s", query, _ScoreDump(self.tasks, scores))
+            logger.debug(
+                "Query routed to task: %s (score %.3f, language %s %.2f)", best_task.name, best_score, lang, confidence
+            )
         if best_score < self.threshold:
-            logger.info("No task above threshold %.3f; using fallback", self.threshold)
+            logger.debug("No task above threshold %.3f; using fallback", self.threshold)
             return None
         return best_task
 
@@ -1,6 +1,7 @@
 import gradio as gr
 
 from app.tabs.about import render as render_about_tab
+from app.tabs.chat import drop_session
 from app.tabs.chat import render as render_chat_tab
 from app.tabs.tools_functions_agents import render as render_tools_functions_agents_tab
 
@@ -20,5 +21,7 @@ with gr.Blocks(
         render_tools_functions_agents_tab()
         render_about_tab()
 
+    demo.unload(drop_session)
+
 if __name__ == "__main__":
     demo.launch()
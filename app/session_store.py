@@ -0,0 +1,156 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Configuration via environment variables:
+#   MAESTRO_HISTORY_WINDOW     nombre de messages conservés par session (20 par défaut, arrondi au pair)
+#   MAESTRO_MESSAGE_MAX_CHARS  taille maximale d'un message conservé (4000 par défaut)
+#   MAESTRO_MAX_SESSIONS       nombre de sessions gardées en mémoire (LRU, 1000 par défaut)
+#   MAESTRO_FEEDBACK_LOG       fichier JSON Lines des retours utilisateurs
+#   MAESTRO_FEEDBACK_BATCH     nombre de retours accumulés avant écriture (20 par défaut)
+
+HISTORY_WINDOW = int(os.getenv("MAESTRO_HISTORY_WINDOW", "20"))
+MESSAGE_MAX_CHARS = int(os.getenv("MAESTRO_MESSAGE_MAX_CHARS", "4000"))
+
+
+def _truncate(text: str, limit: int = MESSAGE_MAX_CHARS) -> str:
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1] + "…"
+
+
+@dataclass
+class SessionState:
+    """État d'une session de chat, conservé côté serveur.
+
+    L'historique est une fenêtre d'échanges (message utilisateur + réponse) :
+    elle ne commence jamais par une réponse orpheline. Chaque échange reçoit un
+    numéro croissant propre à la session, qui sert d'identifiant stable aux
+    messages même quand la fenêtre glisse.
+    """
+
+    window: int = HISTORY_WINDOW
+    exchanges: deque = field(init=False)
+    watt_hours: float = 0.0
+    co2_grams: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _next_exchange: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self.exchanges = deque(maxlen=max(1, self.window // 2))
+
+    def add_exchange(self, user_message: str, bot_message: str, watt_hours: float, co2_grams: float) -> None:
+        with self.lock:
+            self.exchanges.append((
+                self._next_exchange,
+                {"role": "user", "content": _truncate(user_message)},
+                {"role": "assistant", "content": _truncate(bot_message)},
+            ))
+            self._next_exchange += 1
+            self.watt_hours += watt_hours
+            self.co2_grams += co2_grams
+
+    def _history(self) -> list[dict]:
+        return [message for _, user, bot in self.exchanges for message in (user, bot)]
+
+    def snapshot(self) -> tuple[list[dict], float, float]:
+        """Retourne (copie de la fenêtre d'historique, Wh, gCO2) de façon cohérente."""
+        with self.lock:
+            return self._history(), self.watt_hours, self.co2_grams
+
+    def message_id(self, display_index: int) -> int | None:
+        """Identifiant stable du message affiché à la position ``display_index``."""
+        with self.lock:
+            exchange, offset = divmod(display_index, 2)
+            if not 0 <= exchange < len(self.exchanges):
+                return None
+            return self.exchanges[exchange][0] * 2 + offset
+
+    def reset(self) -> None:
+        with self.lock:
+            self.exchanges.clear()
+            self.watt_hours = 0.0
+            self.co2_grams = 0.0
+
+
+class SessionStore:
+    """Sessions indexées par identifiant, bornées en nombre (éviction LRU)."""
+
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> SessionState:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = SessionState()
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return state
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class FeedbackLog:
+    """Journal append-only des retours (JSON Lines), écrit par lots."""
+
+    def __init__(self, path: str | Path, batch_size: int = 20):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._buffer: list[dict] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def record(self, session_id: str, message_id: int | None, liked: bool, content: str) -> None:
+        entry = {
+            "time": time.time(),
+            "session": session_id,
+            "message_id": message_id,
+            "liked": liked,
+            "content": _truncate(str(content), 500),
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        self._write(batch)
+
+    def _write(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in batch)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._write_lock, self.path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            logger.exception("Unable to persist %d feedback entries to %s", len(batch), self.path)
+
+
+sessions = SessionStore(max_sessions=int(os.getenv("MAESTRO_MAX_SESSIONS", "1000")))
+feedback_log = FeedbackLog(
+    os.getenv("MAESTRO_FEEDBACK_LOG", "feedback_log.jsonl"),
+    batch_size=int(os.getenv("MAESTRO_FEEDBACK_BATCH", "20")),
+)
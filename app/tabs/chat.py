@@ -2,6 +2,7 @@ import gradio as gr
 from maestro import maestro
 
 from app.logging_utils import get_logger
+from app.session_store import feedback_log, sessions
 
 logger = get_logger(__name__)
 
@@ -9,22 +10,24 @@ def general_fallback(prompt):
     return "I'm sorry, I don't have the information to answer that question right now."
 
 def send(message, history, attachments=None):
-    logger.info(f"Received message: {message}")
-    logger.debug(f"Current history: {history}")
-    logger.debug(f"Current attachments: {attachments}")
+    logger.debug("Received message: %s", message)
+    logger.debug("Current history: %s", history)
+    logger.debug("Current attachments: %s", attachments)
 
     return maestro.handle_request(message, fallback_fn=general_fallback)
 
 
-total_watt_hours = 0.0  # Watt-hours (Wh)
-total_co2_grams = 0.0   # Grams of CO2
+def _counter_texts(watt_hours, co2_grams):
+    return f"⚡ Energy: {watt_hours:.3f} Wh", f"🌍 CO2: {co2_grams:.3f} g"
 
 
+def drop_session(request: gr.Request):
+    """Libère l'état serveur d'une session quand l'onglet est fermé."""
+    sessions.drop(request.session_hash)
+
 
 def render():
     with gr.Tab("Chat"):
-        feedback_log = {}
-
         def calculate_energy_impact(message, response):
 
             # Estimate tokens (rough approximation: 1 word ≈ 1.3 tokens)
@@ -107,11 +110,13 @@ def render():
             inputs=msg
         )
 
-        def respond(message, chat_history, files):
-            global total_watt_hours, total_co2_grams
+        def respond(message, files, request: gr.Request):
+            # History and counters live server-side, per session; the client only sends the new message
+            state = sessions.get(request.session_hash)
 
             if not message.strip():
-                return "", chat_history, f"⚡ Energy: {total_watt_hours:.3f} Wh", f"🌍 CO2: {total_co2_grams:.3f} g", None, gr.update(visible=False), ""
+                chat_history, watt_hours, co2_grams = state.snapshot()
+                return "", chat_history, *_counter_texts(watt_hours, co2_grams), None, gr.update(visible=False), ""
 
             # Build the full message with file information
             full_message = message
@@ -124,15 +129,15 @@ def render():
                     if hasattr(file, 'name'):
                         file_path = file.name if hasattr(file, 'name') else str(file)
                         file_info += f"- {file_path}\n"
-                        print(f"📎 Attachment location: {file_path}")
+                        logger.debug("📎 Attachment location: %s", file_path)
                     else:
                         file_info += f"- {str(file)}\n"
-                        print(f"📎 Attachment location: {str(file)}")
+                        logger.debug("📎 Attachment location: %s", file)
                 full_message += file_info
                 user_display_message += file_info
 
             # Get response
-            bot_message = send(full_message, chat_history, attachments=files)
+            bot_message = send(full_message, state.snapshot()[0], attachments=files)
 
             maestro_file = "Type de fichier non reconnu"
             if files:
@@ -160,59 +165,49 @@ def render():
             # Calculate realistic energy impact
             watt_hours, co2_grams = calculate_energy_impact(full_message, bot_message)
 
-            # Increment counters
-            total_watt_hours += watt_hours
-            total_co2_grams += co2_grams
-
-            # Update chat history
-            chat_history.append({"role": "user", "content": user_display_message})
-            chat_history.append({"role": "assistant", "content": bot_message})
+            # Update chat history (windowed) and session counters
+            state.add_exchange(user_display_message, bot_message, watt_hours, co2_grams)
+            chat_history, total_watt_hours, total_co2_grams = state.snapshot()
 
             # Update counters display with realistic units
-            watt_text = f"⚡ Energy: {total_watt_hours:.3f} Wh"
-            co2_text = f"🌍 CO2: {total_co2_grams:.3f} g"
+            watt_text, co2_text = _counter_texts(total_watt_hours, total_co2_grams)
 
             # Clear the message input, update chat, update counters, and clear files
             return "", chat_history, watt_text, co2_text, None, gr.update(visible=False), ""
 
-        def handle_like_event(data: gr.LikeData):
+        def handle_like_event(data: gr.LikeData, request: gr.Request):
             """Handle like/dislike - show feedback in a display"""
-            global feedback_log
-
             message_id = data.index
             feedback_type = "👍 Liked" if data.liked else "👎 Disliked"
 
-            # Store feedback
-            feedback_log[message_id] = feedback_type
+            # Store feedback (buffered, appended to the feedback log in batches) under a
+            # stable per-session message id: the display index shifts once the window slides
+            display_index = message_id[0] if isinstance(message_id, (list, tuple)) else message_id
+            stable_id = sessions.get(request.session_hash).message_id(display_index)
+            feedback_log.record(request.session_hash, stable_id, data.liked, data.value)
 
-            # Print to console with more detail
-            print(f"\n{'='*50}")
-            print(f"{feedback_type} message at index: {message_id}")
-            print(f"Message content: {data.value}")
-            print(f"{'='*50}\n")
+            logger.info("%s message at index: %s", feedback_type, message_id)
+            logger.debug("Message content: %s", data.value)
 
             # Create feedback summary
             feedback_text = f"{feedback_type} message #{message_id}"
 
             return gr.update(visible=True, value=feedback_text)
 
-        def reset_counters():
-            global total_watt_hours, total_co2_grams, feedback_log
-            total_watt_hours = 0.0
-            total_co2_grams = 0.0
-            feedback_log = {}
+        def reset_counters(request: gr.Request):
+            sessions.get(request.session_hash).reset()
             return [], "⚡ Energy: 0.000 Wh", "🌍 CO2: 0.000 g", None, gr.update(visible=False), ""
 
         # Event handlers
         submit.click(
             respond,
-            inputs=[msg, chatbot, file_upload],
+            inputs=[msg, file_upload],
             outputs=[msg, chatbot, watt_display, co2_display, file_upload, feedback_display, feedback_display]
         )
 
         msg.submit(
             respond,
-            inputs=[msg, chatbot, file_upload],
+            inputs=[msg, file_upload],
             outputs=[msg, chatbot, watt_display, co2_display, file_upload, feedback_display, feedback_display]
         )
 
@@ -7,6 +7,8 @@ class Task:
     name: str
     description: str
     resolver: Callable[[str], str] | None = field(default=None)
+    # Langues (codes NLLB) acceptées en entrée ; None = toutes
+    languages: tuple[str, ...] | None = field(default=None)
 
     def resolve(self, query: str) -> str:
         if self.resolver:
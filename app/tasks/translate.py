@@ -1,8 +1,12 @@
-import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+import re
+import threading
 
+from app.langid import get_identifier
+from app.logging_utils import get_logger
 from app.tasks.base import Task
 
+logger = get_logger(__name__)
+
 
 def text_query(query):
     """
@@ -31,13 +35,19 @@ _LANG_DETECT = {
 # Charge le modèle uniquement au premier appel
 _model = None
 _tokenizer = None
+# src_lang est un état du tokenizer partagé : le fixer et encoder doivent être atomiques
+_tokenizer_lock = threading.Lock()
 
 
 def _load_nllb():
     global _model, _tokenizer
 
     if _model is None:
-        print("[Translate] Loading NLLB-200 1.3B…")
+        # imports lourds différés : les utilitaires de ce module restent importables sans torch
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        logger.info("Loading NLLB-200 1.3B…")
 
         _tokenizer = AutoTokenizer.from_pretrained(_MODEL_NAME)
 
@@ -47,62 +57,116 @@ def _load_nllb():
             device_map="cuda" if torch.cuda.is_available() else "cpu",          # GPU si dispo, CPU sinon
         )
 
-        print("[Translate] Model loaded successfully.")
+        logger.info("Model loaded successfully.")
 
     return _tokenizer, _model
 
 
 # ---------------------------------------------------------------------
-#                UTIL : Détection ultra simple de langue
+#                UTIL : Détection de langue
 # ---------------------------------------------------------------------
 
-def _detect_language(text: str) -> str:
+# En dessous de ce seuil la langue détectée n'est qu'une supposition
+_MIN_LANG_CONFIDENCE = 0.6
+
+# Langues sources reconnues (celles de app.langid), traduites vers FR ou EN
+_SOURCE_LANGS = ("fra_Latn", "eng_Latn", "spa_Latn", "deu_Latn")
+
+# Langue cible demandée explicitement dans la consigne
+_TARGET_KEYWORDS = {
+    "eng_Latn": ("anglais", "english", "inglés", "ingles", "inglese", "englisch"),
+    "fra_Latn": ("français", "francais", "french", "francés", "frances", "francese", "französisch"),
+}
+_INSTRUCTION_SEPARATOR = re.compile(r"\s*[:\n]\s*")
+
+
+def _detect_languages(texts: list[str]) -> list[str | None]:
     """
-    On reste frugal → une heuristique ultra simple suffit ici.
-    NLLB exige des codes spécifiques (fra_Latn, eng_Latn).
+    Identifie la langue de tout le lot en un seul appel vectorisé (app.langid).
+    NLLB exige des codes spécifiques (fra_Latn, eng_Latn…) ; None si incertain.
     """
-    text_low = text.lower()
+    return [
+        lang if lang in _SOURCE_LANGS and confidence >= _MIN_LANG_CONFIDENCE else None
+        for lang, confidence in get_identifier().detect(texts)
+    ]
+
 
-    # Quelques heuristiques très efficaces pour FR/EN
-    fr_markers = ["é", "è", "ç", "à", "ou", "est", "avec", "pour", "dans"]
-    en_markers = ["the ", "and ", "with ", "from ", "you ", "is ", "are "]
+def _direction(detected: str | None, requested: str | None) -> tuple[str, str]:
+    """
+    Choisit (langue source, langue cible).
+    Une cible demandée est toujours respectée : si la source est incertaine on
+    suppose l'autre langue du couple FR/EN, et si elle vaut déjà la cible le
+    texte est rendu tel quel (source == cible).
+    Sans cible demandée : FR → EN, toute autre langue → FR, FR par défaut.
+    """
+    if requested:
+        if detected is None:
+            detected = "fra_Latn" if requested == "eng_Latn" else "eng_Latn"
+        return detected, requested
+    src_lang = detected or "fra_Latn"
+    return src_lang, "eng_Latn" if src_lang == "fra_Latn" else "fra_Latn"
 
-    if any(m in text_low for m in fr_markers):
-        return "fra_Latn"
-    if any(m in text_low for m in en_markers):
-        return "eng_Latn"
 
-    # fallback : supposons FR → très conservateur
-    return "fra_Latn"
+def _split_instruction(text: str) -> tuple[str, str | None]:
+    """
+    Sépare la consigne du texte à traduire :
+    « Traduis en anglais : Ich liebe dich » → ("Ich liebe dich", "eng_Latn").
+    Sans consigne mentionnant une langue cible, renvoie (text, None).
+    """
+    parts = _INSTRUCTION_SEPARATOR.split(text.strip(), maxsplit=1)
+    if len(parts) == 2 and parts[1]:
+        instruction = parts[0].lower()
+        for lang, keywords in _TARGET_KEYWORDS.items():
+            if any(keyword in instruction for keyword in keywords):
+                return parts[1], lang
+    return text, None
 
 
 # ---------------------------------------------------------------------
 #                FONCTION PRINCIPALE : traduction
 # ---------------------------------------------------------------------
 
-def _translate_resolver(query: dict) -> dict:
+def translate_batch(texts: list[str], targets: list[str | None] | None = None) -> list[str]:
     """
-    Appelé par le routeur.
-    Prend un texte (FR ou EN) et renvoie la traduction dans l'autre langue.
+    Traduit un lot de textes vers la langue cible demandée, ou à défaut
+    FR → EN et toute autre langue reconnue → FR.
+    Les textes sont regroupés par direction pour un seul generate() par groupe.
     """
-    tokenizer, model = _load_nllb()
+    targets = targets or [None] * len(texts)
+
+    # regroupe les indices par (langue source, langue cible)
+    groups: dict[tuple[str, str], list[int]] = {}
+    for i, (detected, requested) in enumerate(zip(_detect_languages(texts), targets, strict=True)):
+        groups.setdefault(_direction(detected, requested), []).append(i)
+
+    translations: list[str] = list(texts)
+    for (src_lang, tgt_lang), indices in groups.items():
+        # déjà dans la langue demandée : rien à traduire
+        if src_lang == tgt_lang:
+            continue
+        decoded = _translate_group([texts[i] for i in indices], src_lang, tgt_lang)
+        for i, translation in zip(indices, decoded, strict=True):
+            translations[i] = translation
+
+    return translations
 
-    # récupérer la partie prompt textuel du dictionnaire query
-    text = text_query(query)
 
-    # détecte la langue source
-    src_lang = _detect_language(text)
+def _translate_group(texts: list[str], src_lang: str, tgt_lang: str) -> list[str]:
+    """Un seul generate() NLLB pour des textes de même direction."""
+    import torch
 
-    # déduit la langue cible
-    tgt_lang = "eng_Latn" if src_lang == "fra_Latn" else "fra_Latn"
+    tokenizer, model = _load_nllb()
 
-    # encode
-    inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        padding=True,
-        truncation=True,
-    ).to(model.device)
+    # encode (le tokenizer NLLB préfixe le code de la langue source)
+    with _tokenizer_lock:
+        tokenizer.src_lang = src_lang
+        inputs = tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+        )
+    inputs = inputs.to(model.device)
 
     # génération (beam search pour qualité max)
     with torch.no_grad():
@@ -115,12 +179,25 @@ def _translate_resolver(query: dict) -> dict:
         )
 
     # decode
-    translation = tokenizer.batch_decode(
+    return tokenizer.batch_decode(
         generated_tokens,
         skip_special_tokens=True
-    )[0]
+    )
+
+
+def _translate_resolver(query: dict) -> dict:
+    """
+    Appelé par le routeur.
+    Prend un texte (FR ou EN) et renvoie la traduction dans l'autre langue,
+    ou dans la langue demandée par la consigne (« Traduis en anglais : … »).
+    """
+    # récupérer la partie prompt textuel du dictionnaire query
+    text = text_query(query)
+
+    # la langue source est celle du texte à traduire, pas celle de la consigne
+    payload, target = _split_instruction(text)
 
-    return translation
+    return translate_batch([payload], [target])[0]
 
 
 # ---------------------------------------------------------------------
@@ -0,0 +1,95 @@
+"""Débit et précision : identifiant n-grammes (app.langid) vs ancienne heuristique.
+
+    uv run python -m benchmarks.bench_langid
+
+Les phrases d'évaluation ne figurent pas dans le corpus d'entraînement.
+"""
+
+import time
+
+from app.langid import get_identifier
+
+EVAL_SET = [
+    ("fra_Latn", "Traduis cette phrase en anglais s'il te plaît."),
+    ("fra_Latn", "Qui va gagner le Hackathon ?"),
+    ("fra_Latn", "Quels sont tes agents ?"),
+    ("fra_Latn", "En quoi es-tu frugale ?"),
+    ("fra_Latn", "Il pleut des cordes depuis ce matin."),
+    ("fra_Latn", "Mon ordinateur ne démarre plus."),
+    ("fra_Latn", "Trouve-moi un hôtel pas cher à Marseille."),
+    ("fra_Latn", "Le chat dort sur le canapé."),
+    ("fra_Latn", "Combien coûte un billet de train pour Nantes ?"),
+    ("fra_Latn", "J'aime beaucoup lire le soir."),
+    ("eng_Latn", "Translate this sentence into French please."),
+    ("eng_Latn", "Who is going to win the hackathon?"),
+    ("eng_Latn", "What are your agents?"),
+    ("eng_Latn", "Our route was blocked by snow."),
+    ("eng_Latn", "It has been pouring since this morning."),
+    ("eng_Latn", "My computer won't start anymore."),
+    ("eng_Latn", "Find me a cheap hotel in Boston."),
+    ("eng_Latn", "The cat is sleeping on the sofa."),
+    ("eng_Latn", "How much is a train ticket to York?"),
+    ("eng_Latn", "Our best estimate is about four hours."),
+    ("spa_Latn", "Traduce esta frase al francés, por favor."),
+    ("spa_Latn", "¿Quién va a ganar el hackathon?"),
+    ("spa_Latn", "Mi ordenador ya no arranca."),
+    ("spa_Latn", "El gato duerme en el sofá."),
+    ("spa_Latn", "¿Cuánto cuesta un billete de tren a Valencia?"),
+    ("deu_Latn", "Übersetze diesen Satz bitte ins Französische."),
+    ("deu_Latn", "Wer wird den Hackathon gewinnen?"),
+    ("deu_Latn", "Mein Computer startet nicht mehr."),
+    ("deu_Latn", "Die Katze schläft auf dem Sofa."),
+    ("deu_Latn", "Was kostet eine Fahrkarte nach Hamburg?"),
+]
+
+
+def legacy_detect_language(text: str) -> str:
+    """Heuristique historique de app/tasks/translate.py (FR/EN uniquement)."""
+    text_low = text.lower()
+    fr_markers = ["é", "è", "ç", "à", "ou", "est", "avec", "pour", "dans"]
+    en_markers = ["the ", "and ", "with ", "from ", "you ", "is ", "are "]
+    if any(m in text_low for m in fr_markers):
+        return "fra_Latn"
+    if any(m in text_low for m in en_markers):
+        return "eng_Latn"
+    return "fra_Latn"
+
+
+def _accuracy(labels: list[str], predictions: list[str]) -> float:
+    return sum(label == pred for label, pred in zip(labels, predictions, strict=True)) / len(labels)
+
+
+def _throughput(fn, texts: list[str], repeat: int = 20) -> float:
+    fn(texts)  # échauffement
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(texts)
+    return repeat * len(texts) / (time.perf_counter() - start)
+
+
+def main(batch_size: int = 10_000) -> None:
+    identifier = get_identifier()
+    labels = [label for label, _ in EVAL_SET]
+    texts = [text for _, text in EVAL_SET]
+    bilingual = [i for i, label in enumerate(labels) if label in ("fra_Latn", "eng_Latn")]
+
+    new_preds = [lang for lang, _ in identifier.detect(texts)]
+    old_preds = [legacy_detect_language(t) for t in texts]
+
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    new_rate = _throughput(identifier.detect, batch, repeat=5)
+    old_rate = _throughput(lambda ts: [legacy_detect_language(t) for t in ts], batch, repeat=5)
+
+    print(f"{'':12s} {'acc FR/EN':>10s} {'acc all':>10s} {'texts/s':>12s}")
+    print(
+        f"{'heuristic':12s} {_accuracy([labels[i] for i in bilingual], [old_preds[i] for i in bilingual]):10.2%} "
+        f"{_accuracy(labels, old_preds):10.2%} {old_rate:12,.0f}"
+    )
+    print(
+        f"{'n-gram':12s} {_accuracy([labels[i] for i in bilingual], [new_preds[i] for i in bilingual]):10.2%} "
+        f"{_accuracy(labels, new_preds):10.2%} {new_rate:12,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
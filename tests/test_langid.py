@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.langid import (
+    UNKNOWN,
+    LanguageIdentifier,
+    _encode,
+    _ngram_hashes,
+    get_identifier,
+    language_penalties,
+)
+
+
+@pytest.fixture(scope="module")
+def identifier():
+    return get_identifier()
+
+
+def test_ngrams_do_not_cross_text_boundaries():
+    _, rows_ab = _ngram_hashes(*_encode(["ab", "cd"]))
+    _, rows_a = _ngram_hashes(*_encode(["ab"]))
+    # même nombre de n-grammes par texte que s'il était seul dans le lot
+    assert np.bincount(rows_ab).tolist() == [len(rows_a), len(rows_a)]
+
+
+def test_batch_matches_single_calls(identifier):
+    texts = ["Le chat dort sur le canapé.", "The cat is sleeping on the sofa."]
+    assert identifier.detect(texts) == [identifier.detect_one(t) for t in texts]
+
+
+def test_detect_empty_batch(identifier):
+    assert identifier.detect([]) == []
+
+
+@pytest.mark.parametrize(
+    ("text", "lang"),
+    [
+        ("Il pleut des cordes depuis ce matin.", "fra_Latn"),
+        ("It has been pouring since this morning.", "eng_Latn"),
+        ("¿Quién va a ganar el hackathon?", "spa_Latn"),
+        ("Wer wird den Hackathon gewinnen?", "deu_Latn"),
+    ],
+)
+def test_known_languages(identifier, text, lang):
+    detected, confidence = identifier.detect_one(text)
+    assert detected == lang
+    assert confidence > 0.8
+
+
+@pytest.mark.parametrize("text", ["", "ok", "Привет как дела", "你好世界"])
+def test_short_or_non_latin_is_rejected(identifier, text):
+    assert identifier.detect_one(text) == (UNKNOWN, 0.0)
+
+
+@pytest.mark.parametrize("text", ["Cerca su internet il meteo di Roma", "Traduci questa frase in inglese"])
+def test_out_of_set_language_has_low_confidence(identifier, text):
+    _, confidence = identifier.detect_one(text)
+    assert confidence < 0.6
+
+
+def test_save_and_load_roundtrip(identifier, tmp_path):
+    path = tmp_path / "weights.npz"
+    identifier.save(path)
+    loaded = LanguageIdentifier.load(path)
+    assert loaded.langs == identifier.langs
+    np.testing.assert_array_equal(loaded.weights, identifier.weights)
+
+
+def test_from_corpus_matches_bundled_weights(identifier):
+    trained = LanguageIdentifier.from_corpus()
+    np.testing.assert_allclose(trained.weights, identifier.weights, rtol=1e-6)
+
+
+def test_language_penalty_changes_the_picked_task():
+    scores = np.array([0.50, 0.45], dtype=np.float32)
+    task_languages = [("fra_Latn",), None]
+
+    penalties = language_penalties(task_languages, "eng_Latn", 0.95, min_confidence=0.9, penalty=0.15)
+    assert int(np.argmax(scores)) == 0
+    assert int(np.argmax(scores - penalties)) == 1
+
+
+@pytest.mark.parametrize(("lang", "confidence"), [("fra_Latn", 0.95), ("eng_Latn", 0.5), (UNKNOWN, 0.0)])
+def test_language_penalty_spares_supported_or_uncertain(lang, confidence):
+    penalties = language_penalties([("fra_Latn",), None], lang, confidence, min_confidence=0.9, penalty=0.15)
+    assert not penalties.any()
@@ -0,0 +1,65 @@
+import json
+import logging
+import sys
+from logging.handlers import QueueHandler
+
+from app import logging_utils
+from app.logging_utils import JsonFormatter, Sampler, configure_logging
+
+
+def _record(msg, *args, exc_info=None):
+    return logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+def test_sampler_rate():
+    quarter = Sampler(0.25)
+    assert [quarter() for _ in range(8)] == [True, False, False, False] * 2
+    never = Sampler(0)
+    assert not any(never() for _ in range(10))
+    always = Sampler(1)
+    assert all(always() for _ in range(10))
+
+
+def test_json_formatter():
+    line = JsonFormatter().format(_record("routed to %s", "OCR"))
+    payload = json.loads(line)
+    assert payload["message"] == "routed to OCR"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "app.test"
+    assert "exc_info" not in payload
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed", exc_info=sys.exc_info())
+    payload = json.loads(JsonFormatter().format(record))
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_configure_logging_is_idempotent():
+    configure_logging()
+    configure_logging()
+    handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+    assert len(handlers) == 1
+
+
+def test_invalid_level_falls_back_to_info(monkeypatch):
+    monkeypatch.setenv("MAESTRO_LOG_LEVEL", "verbose")
+    assert logging_utils._level_from_env() == logging.INFO
+    monkeypatch.setenv("MAESTRO_LOG_LEVEL", "debug")
+    assert logging_utils._level_from_env() == logging.DEBUG
+
+
+def test_json_file_sink(monkeypatch, tmp_path):
+    path = tmp_path / "maestro.jsonl"
+    monkeypatch.setenv("MAESTRO_LOG_JSON_FILE", str(path))
+    handlers = logging_utils._build_handlers()
+    try:
+        assert len(handlers) == 2
+        handlers[1].handle(_record("score %.2f", 0.5))
+    finally:
+        for handler in handlers:
+            handler.close()
+    assert json.loads(path.read_text(encoding="utf-8"))["message"] == "score 0.50"
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from app.session_store import FeedbackLog, SessionState, SessionStore, _truncate
+
+
+def test_window_keeps_whole_exchanges():
+    state = SessionState(window=5)
+    for i in range(4):
+        state.add_exchange(f"u{i}", f"b{i}", 0.1, 0.2)
+
+    history, watt_hours, co2_grams = state.snapshot()
+    assert [m["content"] for m in history] == ["u2", "b2", "u3", "b3"]
+    assert history[0]["role"] == "user"
+    assert watt_hours == pytest.approx(0.4)
+    assert co2_grams == pytest.approx(0.8)
+
+
+def test_snapshot_is_a_copy():
+    state = SessionState()
+    state.add_exchange("u", "b", 0.0, 0.0)
+    history, _, _ = state.snapshot()
+    state.add_exchange("u2", "b2", 0.0, 0.0)
+    assert len(history) == 2
+
+
+def test_message_id_is_stable_when_window_slides():
+    state = SessionState(window=2)
+    state.add_exchange("u0", "b0", 0.0, 0.0)
+    assert state.message_id(1) == 1
+    state.add_exchange("u1", "b1", 0.0, 0.0)
+    assert state.message_id(0) == 2
+    assert state.message_id(1) == 3
+    assert state.message_id(2) is None
+
+
+def test_messages_are_truncated():
+    assert _truncate("abc", limit=5) == "abc"
+    assert _truncate("abcdef", limit=5) == "abcd…"
+
+
+def test_reset():
+    state = SessionState()
+    state.add_exchange("u", "b", 1.0, 1.0)
+    state.reset()
+    assert state.snapshot() == ([], 0.0, 0.0)
+
+
+def test_store_evicts_least_recently_used():
+    store = SessionStore(max_sessions=2)
+    first = store.get("a")
+    second = store.get("b")
+    assert store.get("a") is first
+    third = store.get("c")
+
+    # "b" was the least recently used: it comes back as a fresh state
+    assert store.get("b") is not second
+    # ...which in turn evicted "a", while "c" survived
+    assert store.get("c") is third
+
+
+def test_store_drop():
+    store = SessionStore()
+    first = store.get("a")
+    store.drop("a")
+    store.drop("missing")
+    assert store.get("a") is not first
+
+
+def test_feedback_log_writes_in_batches(tmp_path):
+    path = tmp_path / "logs" / "feedback.jsonl"
+    log = FeedbackLog(path, batch_size=2)
+
+    log.record("s", 1, True, "x")
+    assert not path.exists()
+    log.record("s", 2, False, "y")
+    log.record("s", 3, False, "z")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    log.flush()
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [e["message_id"] for e in entries] == [1, 2, 3]
+    assert entries[0]["liked"] is True
@@ -0,0 +1,96 @@
+import pytest
+
+from app.tasks import translate
+from app.tasks.translate import _direction, _split_instruction, translate_batch
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Traduis en anglais : Ich liebe dich", ("Ich liebe dich", "eng_Latn")),
+        ("Translate into French:\nGood morning", ("Good morning", "fra_Latn")),
+        ("Übersetze ins Französische: Hallo zusammen", ("Hallo zusammen", "fra_Latn")),
+        ("Traduce al inglés: buenos días", ("buenos días", "eng_Latn")),
+        # un deux-points sans langue cible dans la consigne n'est pas une consigne
+        ("Note: the meeting is at noon", ("Note: the meeting is at noon", None)),
+        ("Bonjour tout le monde", ("Bonjour tout le monde", None)),
+        ("Traduis en anglais :", ("Traduis en anglais :", None)),
+    ],
+)
+def test_split_instruction(text, expected):
+    assert _split_instruction(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("detected", "requested", "expected"),
+    [
+        ("fra_Latn", None, ("fra_Latn", "eng_Latn")),
+        ("eng_Latn", None, ("eng_Latn", "fra_Latn")),
+        ("deu_Latn", None, ("deu_Latn", "fra_Latn")),
+        (None, None, ("fra_Latn", "eng_Latn")),
+        ("deu_Latn", "eng_Latn", ("deu_Latn", "eng_Latn")),
+        # une cible demandée n'est jamais inversée
+        (None, "fra_Latn", ("eng_Latn", "fra_Latn")),
+        (None, "eng_Latn", ("fra_Latn", "eng_Latn")),
+        ("fra_Latn", "fra_Latn", ("fra_Latn", "fra_Latn")),
+    ],
+)
+def test_direction(detected, requested, expected):
+    assert _direction(detected, requested) == expected
+
+
+@pytest.fixture
+def groups(monkeypatch):
+    """Remplace NLLB : enregistre chaque groupe et renvoie des traductions factices."""
+    calls = []
+
+    def fake_translate_group(texts, src_lang, tgt_lang):
+        calls.append((src_lang, tgt_lang, list(texts)))
+        return [f"{tgt_lang}:{text}" for text in texts]
+
+    def fail_load():
+        raise AssertionError("le modèle ne doit pas être chargé")
+
+    monkeypatch.setattr(translate, "_translate_group", fake_translate_group)
+    monkeypatch.setattr(translate, "_load_nllb", fail_load)
+    return calls
+
+
+def test_translate_batch_groups_by_direction(groups):
+    texts = [
+        "Il pleut des cordes depuis ce matin.",
+        "It has been pouring since this morning.",
+        "J'aime beaucoup lire le soir.",
+        "Wer wird den Hackathon gewinnen?",
+    ]
+    result = translate_batch(texts)
+
+    assert sorted((src, tgt, len(batch)) for src, tgt, batch in groups) == [
+        ("deu_Latn", "fra_Latn", 1),
+        ("eng_Latn", "fra_Latn", 1),
+        ("fra_Latn", "eng_Latn", 2),
+    ]
+    assert result == [
+        f"eng_Latn:{texts[0]}",
+        f"fra_Latn:{texts[1]}",
+        f"eng_Latn:{texts[2]}",
+        f"fra_Latn:{texts[3]}",
+    ]
+
+
+def test_requested_target_is_honoured_for_uncertain_source(groups):
+    assert translate_batch(["Hi"], ["fra_Latn"]) == ["fra_Latn:Hi"]
+    assert groups == [("eng_Latn", "fra_Latn", ["Hi"])]
+
+
+def test_text_already_in_requested_language_is_returned_as_is(groups):
+    text = "Il pleut des cordes depuis ce matin."
+    assert translate_batch([text], ["fra_Latn"]) == [text]
+    assert groups == []
+
+
+def test_resolver_uses_payload_language(groups):
+    assert translate._translate_resolver("Traduis en anglais : Wer wird den Hackathon gewinnen?") == (
+        "eng_Latn:Wer wird den Hackathon gewinnen?"
+    )
+    assert groups[0][:2] == ("deu_Latn", "eng_Latn")